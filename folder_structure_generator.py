@@ -1,8 +1,41 @@
 #!/usr/bin/env python3
 
+import io
 import os
+import re
 import sys
 import argparse
+import functools
+from fnmatch import translate as _glob_translate
+
+try:
+    # google-re2 matches in linear time (DFA), with no catastrophic
+    # backtracking on pathological ignore patterns. Optional; the
+    # compile/match calls used here are API-compatible with re.
+    import re2 as _re
+except ImportError:
+    _re = re
+
+def _translate(pattern):
+    """fnmatch.translate, adjusted for RE2, which spells end-of-text \\z
+    rather than the stdlib's \\Z."""
+    translated = _glob_translate(pattern)
+    if _re is not re and translated.endswith(r'\Z'):
+        translated = translated[:-2] + r'\z'
+    return translated
+
+def has_wildcard(pattern):
+    """True if the pattern contains glob metacharacters."""
+    return any(c in pattern for c in '*?[')
+
+def make_matcher(dir_set, exact_set, combined):
+    """Build a memoized ignore matcher; repeated basenames become cache hits."""
+    @functools.lru_cache(maxsize=4096)
+    def _match(name):
+        if name in exact_set or name in dir_set:
+            return True
+        return combined is not None and combined.match(name) is not None
+    return _match
 
 class FolderStructureGenerator:
     DEFAULT_IGNORE_PATTERNS = [
@@ -20,63 +53,112 @@ class FolderStructureGenerator:
             ignored_folders = []
         self.ignored_folders = set(self.DEFAULT_IGNORE_PATTERNS).union(set(ignored_folders))
         self.ignore_file = ignore_file
+        self._pattern_cache = None
 
     def load_ignore_patterns(self, root_dir):
+        """Load patterns, pre-partitioned into (dir_set, exact_set, file_globs).
+
+        Most real ignore entries are exact names (__pycache__, .git, ...),
+        which a set-membership test handles without any glob machinery;
+        only patterns with wildcards go through the compiled regex."""
         patterns = list(self.ignored_folders)
         ignore_path = os.path.join(root_dir, self.ignore_file)
-        if os.path.exists(ignore_path):
-            with open(ignore_path, 'r') as f:
+        # EAFP: opening directly saves the stat(2) an exists() check costs.
+        try:
+            f = open(ignore_path, 'r')
+        except FileNotFoundError:
+            pass
+        else:
+            with f:
                 file_patterns = [line.strip() for line in f if line.strip() and not line.startswith('#')]
                 patterns.extend(file_patterns)
-        return patterns
+        names = [p for p in patterns if not p.endswith('/')]
+        return (frozenset(p.rstrip('/') for p in patterns if p.endswith('/')),
+                frozenset(p for p in names if not has_wildcard(p)),
+                tuple(p for p in names if has_wildcard(p)))
+
+    def _compile_ignore_patterns(self, file_globs):
+        """Translate the file globs into one combined regex (None if empty)."""
+        if self._pattern_cache is not None and self._pattern_cache[0] == file_globs:
+            return self._pattern_cache[1]
+        combined = None
+        if file_globs:
+            try:
+                combined = _re.compile('|'.join(f"(?:{_translate(p)})" for p in file_globs))
+            except _re.error:
+                # RE2 lacks some constructs the stdlib accepts; fall back.
+                combined = re.compile('|'.join(f"(?:{_glob_translate(p)})" for p in file_globs))
+        self._pattern_cache = (file_globs, combined)
+        return combined
 
     def generate_folder_structure_txt(self, current_directory, output_path=None):
         if not os.path.exists(current_directory):
             raise FileNotFoundError(f"The directory '{current_directory}' does not exist.")
 
-        ignore_patterns = self.load_ignore_patterns(current_directory)
-
-        tree_lines = [f"{os.path.basename(current_directory)}/"]
+        dir_set, exact_set, file_globs = self.load_ignore_patterns(current_directory)
+        combined = self._compile_ignore_patterns(file_globs)
 
-        def matches_ignore_pattern(entry):
-            for pattern in ignore_patterns:
-                if pattern.endswith('/'):
-                    # Directory pattern
-                    dir_pattern = pattern.rstrip('/')
-                    if dir_pattern == entry:
-                        return True
-                else:
-                    # File pattern with possible wildcards
-                    if fnmatch.fnmatch(entry, pattern):
-                        return True
-            return False
-
-        def recurse(dir_path, prefix):
-            entries = sorted(os.listdir(dir_path))
-            # Exclude the ignore file itself to prevent recursion
-            entries = [e for e in entries if e != self.ignore_file]
-            entries = [e for e in entries if not matches_ignore_pattern(e)]
-            for i, entry in enumerate(entries):
-                path = os.path.join(dir_path, entry)
-                connector = "├── " if i < len(entries) - 1 else "└── "
-                if os.path.isdir(path):
-                    tree_lines.append(f"{prefix}{connector}{entry}/")
-                    new_prefix = prefix + ("│   " if i < len(entries) - 1 else "    ")
-                    recurse(path, new_prefix)
-                else:
-                    tree_lines.append(f"{prefix}{connector}{entry}")
-
-        import fnmatch  # Moved inside to avoid potential issues
-        recurse(current_directory, "")
-        tree_str = "\n".join(tree_lines) + "\n"
+        # Fresh matcher per invocation, so the cache never outlives the patterns.
+        matches_ignore_pattern = make_matcher(dir_set, exact_set, combined)
 
+        # Stream lines straight into the sink instead of accumulating them in
+        # a list and joining at the end; with an output file this avoids ever
+        # holding the whole tree in memory.
         if output_path:
-            with open(output_path, 'w') as f:
-                f.write(tree_str)
+            with open(output_path, 'w') as out:
+                self._write_tree(current_directory, matches_ignore_pattern, out)
             print(f"Folder structure written to {output_path}")
-            return tree_str
+            return None
+
+        buf = io.StringIO()
+        self._write_tree(current_directory, matches_ignore_pattern, buf)
+        return buf.getvalue()
 
-        return tree_str
+    def _write_tree(self, current_directory, matches_ignore_pattern, out):
+        out.write(f"{os.path.basename(current_directory)}/\n")
+
+        # Bind the hot names locally so the per-entry filter below is a
+        # single fast-local lookup per listing rather than an attribute or
+        # closure-cell access per entry.
+        ignore_file = self.ignore_file
+        ignored = matches_ignore_pattern
+
+        # Explicit stack instead of recursion: no per-directory Python frame,
+        # and no recursion limit on very deep trees. Entries are pushed in
+        # reverse so subtrees pop before their later siblings.
+        stack = [("dir", current_directory, "")]
+        while stack:
+            item = stack.pop()
+            if item[0] == "dir":
+                _, dir_path, prefix = item
+                # Filter while scanning (also excludes the ignore file itself
+                # to prevent recursion), splitting directories from files so
+                # each smaller group is sorted on its own and directories are
+                # listed first.
+                d_entries = []
+                f_entries = []
+                with os.scandir(dir_path) as it:
+                    for e in it:
+                        if e.name == ignore_file or ignored(e.name):
+                            continue
+                        if e.is_dir(follow_symlinks=False):
+                            d_entries.append(e)
+                        else:
+                            f_entries.append(e)
+                d_entries.sort(key=lambda e: e.name)
+                f_entries.sort(key=lambda e: e.name)
+                entries = d_entries + f_entries
+                last = len(entries) - 1
+                for i in range(last, -1, -1):
+                    stack.append(("entry", entries[i], prefix, i == last))
+            else:
+                _, entry, prefix, is_last = item
+                connector = "└── " if is_last else "├── "
+                if entry.is_dir(follow_symlinks=False):
+                    out.write(f"{prefix}{connector}{entry.name}/\n")
+                    stack.append(("dir", entry.path, prefix + ("    " if is_last else "│   ")))
+                else:
+                    out.write(f"{prefix}{connector}{entry.name}\n")
 
 def main():
     parser = argparse.ArgumentParser(description="Generate a tree structure of a directory.")
@@ -1,61 +1,147 @@
 #!/usr/bin/env python3
 
 import os
+import re
 import sys
+import shutil
+import threading
+import concurrent.futures
 import fnmatch
+import functools
 from rich.console import Console
 from rich.table import Table
 from rich.prompt import Prompt
 import readchar
 import pyperclip
 import argparse
-from rich.style import Style
+
+try:
+    # google-re2 matches in linear time (DFA), with no catastrophic
+    # backtracking on pathological ignore patterns. Optional; the
+    # compile/match calls used here are API-compatible with re.
+    import re2 as _re
+except ImportError:
+    _re = re
+
+def _translate(pattern):
+    """fnmatch.translate, adjusted for RE2, which spells end-of-text \\z
+    rather than the stdlib's \\Z."""
+    translated = fnmatch.translate(pattern)
+    if _re is not re and translated.endswith(r'\Z'):
+        translated = translated[:-2] + r'\z'
+    return translated
+
+def has_wildcard(pattern):
+    """True if the pattern contains glob metacharacters."""
+    return any(c in pattern for c in '*?[')
 
 def load_ignore_patterns(ignore_files):
-    """Load ignore patterns from a list of files."""
+    """Load ignore patterns, pre-partitioned into (dir_set, exact_set, file_globs).
+
+    Most real ignore entries are exact names (__pycache__, .git, ...),
+    which a set-membership test handles without any glob machinery; only
+    patterns with wildcards go through the compiled regex."""
     patterns = []
     for ignore_file in ignore_files:
-        if os.path.exists(ignore_file):
-            with open(ignore_file, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#'):
-                        patterns.append(line)
-    return patterns
-
-def is_ignored(path, patterns, root_dir):
-    """Check if the path matches any of the ignore patterns."""
-    relative_path = os.path.relpath(path, root_dir)
-    path_parts = relative_path.split(os.sep)
-
-    for pattern in patterns:
-        if pattern.endswith('/'):
-            # Directory pattern
-            dir_pattern = pattern.rstrip('/')
-            if dir_pattern in path_parts:
-                return True
-        else:
-            # File pattern with possible wildcards
-            if fnmatch.fnmatch(os.path.basename(path), pattern):
-                return True
-    return False
+        # EAFP: opening directly saves the stat(2) an exists() check costs.
+        try:
+            f = open(ignore_file, 'r')
+        except FileNotFoundError:
+            continue
+        with f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    patterns.append(line)
+    names = [p for p in patterns if not p.endswith('/')]
+    return (frozenset(p.rstrip('/') for p in patterns if p.endswith('/')),
+            frozenset(p for p in names if not has_wildcard(p)),
+            tuple(p for p in names if has_wildcard(p)))
+
+def compile_ignore_patterns(file_globs):
+    """Translate the file globs into one combined regex (None if empty)."""
+    if not file_globs:
+        return None
+    try:
+        return _re.compile('|'.join(f"(?:{_translate(p)})" for p in file_globs))
+    except _re.error:
+        # RE2 lacks some constructs the stdlib accepts; fall back.
+        return re.compile('|'.join(f"(?:{fnmatch.translate(p)})" for p in file_globs))
+
+def is_ignored(name, dir_set, exact_set, combined, is_dir=False):
+    """Check if the entry name matches any of the compiled ignore patterns."""
+    if name in exact_set:
+        return True
+    if is_dir and name in dir_set:
+        return True
+    return combined is not None and combined.match(name) is not None
+
+def make_ignore_matcher(dir_set, exact_set, combined):
+    """Build a memoized ignore matcher; repeated basenames become cache hits."""
+    @functools.lru_cache(maxsize=4096)
+    def _match(name, is_dir=False):
+        return is_ignored(name, dir_set, exact_set, combined, is_dir)
+    return _match
+
+def _list_files_parallel(root_dir, ignored, jobs):
+    """Scan directories concurrently. os.scandir releases the GIL during the
+    syscall, so threads overlap I/O latency on slow (e.g. network)
+    filesystems where a serial walk is latency-bound."""
+    files = []
+    lock = threading.Lock()
+
+    def scan(dir_path):
+        found = []
+        subdirs = []
+        with os.scandir(dir_path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if not ignored(entry.name, is_dir=True):
+                        subdirs.append(entry.path)
+                elif not ignored(entry.name):
+                    found.append(entry.path)
+        with lock:
+            files.extend(found)
+        return subdirs
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as pool:
+        pending = {pool.submit(scan, root_dir)}
+        while pending:
+            done, pending = concurrent.futures.wait(
+                pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                for subdir in future.result():
+                    pending.add(pool.submit(scan, subdir))
+    return files
 
-def list_files(root_dir, ignore_files):
+def list_files(root_dir, ignore_files, jobs=1):
     """List files in root_dir, ignoring patterns from specified ignore files."""
-    ignore_patterns = load_ignore_patterns(ignore_files)
+    dir_set, exact_set, file_globs = load_ignore_patterns(ignore_files)
+    # Fresh matcher per run, so the cache never outlives the patterns.
+    ignored = make_ignore_matcher(dir_set, exact_set, compile_ignore_patterns(file_globs))
+
+    if jobs > 1:
+        return _list_files_parallel(root_dir, ignored, jobs)
 
     files = []
-    for dirpath, dirnames, filenames in os.walk(root_dir):
-        # Filter directories in-place
-        dirnames[:] = [d for d in dirnames if not is_ignored(os.path.join(dirpath, d), ignore_patterns, root_dir)]
-
-        # Filter and add files
-        for file in filenames:
-            file_abs_path = os.path.join(dirpath, file)
-            if not is_ignored(file_abs_path, ignore_patterns, root_dir):
-                files.append(file_abs_path)
+    stack = [root_dir]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if not ignored(entry.name, is_dir=True):
+                        stack.append(entry.path)
+                elif not ignored(entry.name):
+                    files.append(entry.path)
     return files
 
+@functools.lru_cache(maxsize=256)
+def _color_for_ext(ext):
+    """Generate a shade of grey for a file extension; extensions repeat
+    heavily across a tree, so cache the rendered color string."""
+    hash_value = hash(ext) % 200  # Using modulo to limit the range
+    return f"rgb({hash_value},{hash_value},{hash_value})"
+
 def get_file_color(file_path):
     """Determine the color for the file path based on its type."""
     if os.path.isdir(file_path):
@@ -63,10 +149,7 @@ def get_file_color(file_path):
     elif file_path.endswith('.py'):
         return "white"
     else:
-        # Generate a shade of grey based on the file extension
-        ext = os.path.splitext(file_path)[1]
-        hash_value = hash(ext) % 200  # Using modulo to limit the range
-        return f"rgb({hash_value},{hash_value},{hash_value})"
+        return _color_for_ext(os.path.splitext(file_path)[1])
 
 def get_folder_colors():
     """Return a list of 16 distinct, readable colors for use on a black background."""
@@ -77,15 +160,29 @@ def get_folder_colors():
         "light_sea_green", "purple", "khaki1", "medium_violet_red"
     ]
 
-def assign_folder_colors(files):
+def assign_folder_colors(files, folders=None):
     """Assign colors to folders based on their names."""
-    folders = set(os.path.dirname(file) for file in files)
+    if folders is None:
+        folders = [os.path.dirname(file) for file in files]
     colors = get_folder_colors()
-    return {folder: colors[i % len(colors)] for i, folder in enumerate(folders)}
+    return {folder: colors[i % len(colors)] for i, folder in enumerate(set(folders))}
 
-def display_files(files, selected, key_mapping):
-    """Display files with their assigned keys, selection status, and color-coded folders."""
-    console = Console()
+def precompute_file_rows(files):
+    """Pre-split and pre-style the static row cells; the file list is
+    immutable during selection, so this only needs to happen once."""
+    # Split each path once and share the dirnames with the color pass.
+    folders = [os.path.dirname(file) for file in files]
+    folder_colors = assign_folder_colors(files, folders)
+    rows = []
+    for file, folder in zip(files, folders):
+        name, ext = os.path.splitext(os.path.basename(file))
+        folder_name = os.path.basename(folder)
+        file_color = folder_colors[folder]
+        rows.append((f"[{file_color}]{name}[/{file_color}]", folder_name, ext))
+    return rows
+
+def build_files_table(files, selected, key_mapping, rows=None):
+    """Build the file table with assigned keys, selection status, and color-coded folders."""
     table = Table(show_header=True, header_style="bold magenta")
     table.add_column("S", width=1)
     table.add_column("Key", width=1)
@@ -93,79 +190,66 @@ def display_files(files, selected, key_mapping):
     table.add_column("Folder", style="green")
     table.add_column("Extension", style="yellow")
 
-    folder_colors = assign_folder_colors(files)
+    if rows is None:
+        rows = precompute_file_rows(files)
 
-    for idx, file in enumerate(files):
-        key = key_mapping.get(idx, '?')
+    for idx, (styled_name, folder_name, ext) in enumerate(rows):
+        key = key_mapping[idx] if idx < len(key_mapping) else '?'
         selected_mark = '[green]✔️[/green]' if idx in selected else ''
-        
-        filename = os.path.basename(file)
-        name, ext = os.path.splitext(filename)
-        folder = os.path.dirname(file)
-        folder_name = os.path.basename(folder)
-        
-        file_color = folder_colors[folder]
-        name_style = Style(color=file_color)
-        
-        # Update this line to use the style correctly
-        table.add_row(
-            selected_mark,
-            key,
-            f"[{file_color}]{name}[/{file_color}]",  # Apply the style directly in the string
-            folder_name,
-            ext
-        )
-
-    console.clear()
-    console.print(table)
+        table.add_row(selected_mark, key, styled_name, folder_name, ext)
+
+    return table
 
 def assign_keys(num_files, key_sequence):
     """Assign unique keys from a predefined sequence to each file."""
     if num_files > len(key_sequence):
         print(f"Too many files! Showing only the first {len(key_sequence)} files.")
-        return {idx: key_sequence[idx] for idx in range(len(key_sequence))}, True
-    return {idx: key_sequence[idx] for idx in range(num_files)}, False
+        return key_sequence[:], True
+    return key_sequence[:num_files], False
 
 def get_key_mapping(keys):
     """Reverse mapping from key to index."""
-    return {v: k for k, v in keys.items()}
+    return {k: i for i, k in enumerate(keys)}
 
 def concatenate_selected_files(selected, files, root_dir):
     """Concatenate content of selected files and tree.txt into a single output file and copy to clipboard."""
-    output_content = ""
+    # Copy bytes straight from source to output: the disk path needs no
+    # UTF-8 decode/re-encode round trip. Text is only decoded once at the
+    # end, for the clipboard.
     output_file = os.path.join(root_dir, 'concatenated_output.txt')
 
-    with open(output_file, 'w') as outfile:
+    with open(output_file, 'wb') as outfile:
         # Include tree.txt if it exists
         tree_file = os.path.join(root_dir, 'tree.txt')
-        if os.path.exists(tree_file):
-            with open(tree_file, 'r') as tf:
-                tree_content = tf.read()
-                output_content += f"# {tree_file}\n{tree_content}\n"
-                outfile.write(f"# {tree_file}\n{tree_content}\n")
-        else:
+        try:
+            tf = open(tree_file, 'rb')
+        except FileNotFoundError:
             print(f"Warning: {tree_file} does not exist and will not be included.")
+        else:
+            with tf:
+                outfile.write(f"# {tree_file}\n".encode())
+                shutil.copyfileobj(tf, outfile, length=1 << 20)
+                outfile.write(b"\n")
 
         # Append selected files
         for idx in selected:
             file_path = files[idx]
             try:
-                with open(file_path, 'r', encoding='utf-8') as infile:
-                    content = infile.read()
-                    output_content += f"# {file_path}\n{content}\n"
-                    outfile.write(f"# {file_path}\n{content}\n")
+                with open(file_path, 'rb') as infile:
+                    outfile.write(f"# {file_path}\n".encode())
+                    shutil.copyfileobj(infile, outfile, length=1 << 20)
+                    outfile.write(b"\n")
             except FileNotFoundError:
                 print(f"Warning: Could not find file {file_path}. Skipping.")
-            except UnicodeDecodeError:
-                print(f"Warning: Could not decode file {file_path}. Skipping.")
             except Exception as e:
                 print(f"Warning: Could not read file {file_path}. Error: {e}. Skipping.")
 
     # Copy the concatenated content to the clipboard
     try:
-        pyperclip.copy(output_content)
+        with open(output_file, 'r', encoding='utf-8') as f:
+            pyperclip.copy(f.read())
         print(f"Files concatenated into {output_file} and copied to clipboard.")
-    except pyperclip.PyperclipException:
+    except (UnicodeDecodeError, pyperclip.PyperclipException):
         print(f"Files concatenated into {output_file}. Failed to copy to clipboard.")
 
 def interactive_file_selection(files, key_mapping, root_dir):
@@ -173,8 +257,15 @@ def interactive_file_selection(files, key_mapping, root_dir):
     selected = set()
     key_to_index = get_key_mapping(key_mapping)
 
+    # Build the table once; only one row's selection mark changes per
+    # keystroke, so each redraw just re-prints the cached table.
+    console = Console()
+    rows = precompute_file_rows(files)
+    table = build_files_table(files, selected, key_mapping, rows)
+
     while True:
-        display_files(files, selected, key_mapping)
+        console.clear()
+        console.print(table)
         key = readchar.readkey()
         if key == '\n':  # Save and exit on Enter key
             break
@@ -182,14 +273,21 @@ def interactive_file_selection(files, key_mapping, root_dir):
             idx = key_to_index[key]
             if idx in selected:
                 selected.remove(idx)
+                mark = ''
             else:
                 selected.add(idx)
+                mark = '[green]✔️[/green]'
+            # Rich has no public per-cell update API; poke the S column's
+            # cell directly instead of rebuilding the whole table.
+            table.columns[0]._cells[idx] = mark
         # Ignore other keys
     return selected
 
 def main():
     parser = argparse.ArgumentParser(description="Select files from a directory.")
     parser.add_argument("directory", help="The directory to select files from.")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Number of concurrent directory-scan threads (helps on network filesystems).")
     args = parser.parse_args()
 
     root_dir = args.directory
@@ -202,7 +300,7 @@ def main():
     selectignore = os.path.join(root_dir, '.selectignore')
     ignore_files = [gitignore, selectignore]
 
-    files = list_files(root_dir, ignore_files)
+    files = list_files(root_dir, ignore_files, jobs=args.jobs)
     if not files:
         print("No files to select.")
         sys.exit(0)